@@ -11,6 +11,12 @@ from typing import List, Dict, Any, Optional
 import json
 import torch
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Add the project root to Python path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
@@ -19,58 +25,15 @@ from src.providers.asr.adapters.olmoasr_adapter import OLMoASRAdapter
 from src.providers.asr.adapters.canary_qwen_adapter import CanaryQwenAdapter
 from src.providers.asr.storage.postgres_storage import PostgreSQLStorage
 from src.providers.asr.core.config import ConfigManager
+from src.providers.asr.metrics.error_rates import calculate_cer, calculate_wer, calculate_wer_batch
 
 
-def calculate_wer(reference: str, hypothesis: str) -> float:
-    """Calculate Word Error Rate (WER)."""
-    ref_words = reference.lower().split()
-    hyp_words = hypothesis.lower().split()
-
-    if len(ref_words) == 0:
-        return 1.0 if len(hyp_words) > 0 else 0.0
-
-    # Simple Levenshtein distance for words
-    d = [[0] * (len(hyp_words) + 1) for _ in range(len(ref_words) + 1)]
-
-    for i in range(len(ref_words) + 1):
-        d[i][0] = i
-    for j in range(len(hyp_words) + 1):
-        d[0][j] = j
-
-    for i in range(1, len(ref_words) + 1):
-        for j in range(1, len(hyp_words) + 1):
-            if ref_words[i-1] == hyp_words[j-1]:
-                d[i][j] = d[i-1][j-1]
-            else:
-                d[i][j] = min(d[i-1][j], d[i][j-1], d[i-1][j-1]) + 1
-
-    return d[len(ref_words)][len(hyp_words)] / len(ref_words)
-
-
-def calculate_cer(reference: str, hypothesis: str) -> float:
-    """Calculate Character Error Rate (CER)."""
-    ref_chars = list(reference.lower())
-    hyp_chars = list(hypothesis.lower())
-
-    if len(ref_chars) == 0:
-        return 1.0 if len(hyp_chars) > 0 else 0.0
-
-    # Simple Levenshtein distance for characters
-    d = [[0] * (len(hyp_chars) + 1) for _ in range(len(ref_chars) + 1)]
-
-    for i in range(len(ref_chars) + 1):
-        d[i][0] = i
-    for j in range(len(hyp_chars) + 1):
-        d[0][j] = j
-
-    for i in range(1, len(ref_chars) + 1):
-        for j in range(1, len(hyp_chars) + 1):
-            if ref_chars[i-1] == hyp_chars[j-1]:
-                d[i][j] = d[i-1][j-1]
-            else:
-                d[i][j] = min(d[i-1][j], d[i][j-1], d[i-1][j-1]) + 1
-
-    return d[len(ref_chars)][len(hyp_chars)] / len(ref_chars)
+def _score_results(results: List[Dict[str, Any]], reference: str):
+    """Fill in WER for all successful results with one batched call."""
+    successful = [r for r in results if r.get("status") == "SUCCESS"]
+    wers = calculate_wer_batch(reference, [r["transcription"] for r in successful])
+    for result, wer in zip(successful, wers):
+        result["wer"] = wer
 
 def load_reference_text() -> str:
     """Load the reference transcription."""
@@ -111,6 +74,8 @@ def test_model(adapter, model_name: str, audio_file: str, reference: str,
         # Calculate metrics
         wer = calculate_wer(reference, result.text)
         cer = calculate_cer(reference, result.text)
+        word_count = len(result.text.split())
+        char_count = len(result.text)
 
         # Calculate processing speed
         audio_duration = result.metadata.get("audio_duration", 164)
@@ -136,8 +101,8 @@ def test_model(adapter, model_name: str, audio_file: str, reference: str,
                     model_parameters=result.metadata,
                     metadata={
                         "speed_ratio": speed_ratio,
-                        "word_count": len(result.text.split()),
-                        "char_count": len(result.text),
+                        "word_count": word_count,
+                        "char_count": char_count,
                         "total_time": total_time
                     }
                 )
@@ -154,8 +119,8 @@ def test_model(adapter, model_name: str, audio_file: str, reference: str,
             "processing_time": result.processing_time,
             "total_time": total_time,
             "speed_ratio": speed_ratio,
-            "word_count": len(result.text.split()),
-            "char_count": len(result.text),
+            "word_count": word_count,
+            "char_count": char_count,
             "confidence_available": result.confidence_scores is not None,
             "metadata": result.metadata
         }
@@ -211,8 +176,7 @@ def run_fast_mode(audio_file: str, reference: str, debug: bool):
             segments, _ = model.transcribe(audio_file, beam_size=1)
             text = " ".join([s.text for s in segments])
             processing_time = time.time() - start_time
-            wer = calculate_wer(reference, text)
-            return {"model_name": model_name, "status": "SUCCESS", "wer": wer, "processing_time": processing_time, "transcription": text}
+            return {"model_name": model_name, "status": "SUCCESS", "processing_time": processing_time, "transcription": text}
         except Exception as e:
             if debug:
                 import traceback
@@ -225,6 +189,7 @@ def run_fast_mode(audio_file: str, reference: str, debug: bool):
     ]
 
     results = [test_fast(name, size) for name, size in models_to_test]
+    _score_results(results, reference)
     print_leaderboard(results)
     save_results(results)
 
@@ -241,8 +206,7 @@ def run_minimal_mode(audio_file: str, reference: str, debug: bool):
             segments, _ = model.transcribe(audio_file, beam_size=1)
             text = " ".join([s.text for s in segments])
             processing_time = time.time() - start_time
-            wer = calculate_wer(reference, text)
-            return {"model_name": model_name, "status": "SUCCESS", "wer": wer, "processing_time": processing_time, "transcription": text}
+            return {"model_name": model_name, "status": "SUCCESS", "processing_time": processing_time, "transcription": text}
         except Exception as e:
             if debug:
                 import traceback
@@ -254,6 +218,7 @@ def run_minimal_mode(audio_file: str, reference: str, debug: bool):
     ]
 
     results = [test_minimal(name, size) for name, size in models_to_test]
+    _score_results(results, reference)
     print_leaderboard(results)
     save_results(results)
 
@@ -288,8 +253,12 @@ def print_leaderboard(results: List[Dict[str, Any]]):
 
 def save_results(results: List[Dict[str, Any]], output_file: str = "leaderboard_results.json"):
     """Save detailed results to a JSON file."""
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2, default=str)
+    if HAS_ORJSON:
+        with open(output_file, 'wb', buffering=65536) as f:
+            f.write(orjson.dumps(results, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_file, 'w', buffering=65536) as f:
+            json.dump(results, f, indent=2, default=str)
     print(f"\nDetailed results saved to: {output_file}")
 
 def main():
@@ -69,7 +69,9 @@ class VaporeonHandler(BaseDatasetHandler):
             "--output", str(dataset_dir / "%(id)s_%(title)s.%(ext)s"),
             youtube_url
         ]
-        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        # Let yt-dlp's progress output stream to the console instead of buffering
+        # it in memory; only stderr is kept for error reporting.
+        subprocess.run(cmd, check=True, stdout=None, stderr=subprocess.PIPE, text=True)
 
     def _create_reference_files(self, dataset_dir: Path, audio_file: Path):
         """Creates the reference transcript and metadata file."""
@@ -11,6 +11,7 @@ Usage:
     python src/process_private_datasets.py --list-datasets
 """
 
+import re
 import sys
 import argparse
 import time
@@ -38,6 +39,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Key terms checked by the Vaporeon baseline validation, compiled once at import
+VAPOREON_KEY_TERMS = ["vaporeon", "pokemon", "human", "breeding"]
+VAPOREON_KEY_TERMS_RE = re.compile("|".join(map(re.escape, VAPOREON_KEY_TERMS)))
+
 
 class PrivateDatasetProcessor:
     """Processes .wmv files in private datasets with privacy controls."""
@@ -188,8 +193,9 @@ class PrivateDatasetProcessor:
             predicted_lower = result.text.lower()
             reference_lower = reference_text.lower()
             
-            key_terms = ["vaporeon", "pokemon", "human", "breeding"]
-            found_terms = [term for term in key_terms if term in predicted_lower]
+            # One scan of the transcript for all terms instead of one per term
+            matched = set(VAPOREON_KEY_TERMS_RE.findall(predicted_lower))
+            found_terms = [term for term in VAPOREON_KEY_TERMS if term in matched]
             
             # Calculate basic word overlap
             predicted_words = set(predicted_lower.split())
@@ -273,7 +279,7 @@ class PrivateDatasetProcessor:
             placeholder_text = f"[PLACEHOLDER] Transcript for {wmv_file.name} would be generated here"
             
             # Save transcript
-            with open(output_paths['transcript'], 'w') as f:
+            with open(output_paths['transcript'], 'w', buffering=65536) as f:
                 f.write(placeholder_text)
             
             # Save metadata
@@ -287,7 +293,7 @@ class PrivateDatasetProcessor:
                 'status': 'placeholder'
             }
             
-            with open(output_paths['metadata'], 'w') as f:
+            with open(output_paths['metadata'], 'w', buffering=65536) as f:
                 json.dump(metadata, f, indent=2)
             
             logger.info(f"  ✅ Created placeholder files in {processing_time:.2f}s")
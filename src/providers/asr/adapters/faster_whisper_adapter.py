@@ -59,7 +59,8 @@ class FasterWhisperAdapter(ASRModelAdapter):
         
         Args:
             audio_path: Path to audio file
-            **kwargs: Additional parameters (beam_size, language, etc.)
+            **kwargs: Additional parameters (beam_size, language, vad_filter,
+                condition_on_previous_text)
             
         Returns:
             TranscriptionResult with transcription and metadata
@@ -74,12 +75,16 @@ class FasterWhisperAdapter(ASRModelAdapter):
         # Set default parameters
         beam_size = kwargs.get("beam_size", 5)
         language = kwargs.get("language", None)
+        vad_filter = kwargs.get("vad_filter", False)
+        condition_on_previous_text = kwargs.get("condition_on_previous_text", True)
         
         try:
             segments, info = self._model.transcribe(
                 audio_path,
                 beam_size=beam_size,
-                language=language
+                language=language,
+                vad_filter=vad_filter,
+                condition_on_previous_text=condition_on_previous_text
             )
             
             # Collect segments and confidence scores
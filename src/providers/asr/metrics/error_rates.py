@@ -0,0 +1,156 @@
+"""
+Word and character error rate metrics.
+
+Kept free of model and storage dependencies so they can be imported (and tested) on their own.
+"""
+
+from functools import lru_cache
+from typing import List, Tuple
+
+# rapidfuzz provides a C++ Levenshtein implementation; fall back to pure Python if missing
+try:
+    from rapidfuzz import process
+    from rapidfuzz.distance import Levenshtein
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+# Without rapidfuzz, numba JIT-compiles the DP fallback to native code
+try:
+    import numpy as np
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _levenshtein_ids(ref_ids, hyp_ids):
+        """Wagner-Fischer over integer token ids with two rolling rows."""
+        n = hyp_ids.shape[0]
+        prev = np.arange(n + 1)
+        curr = np.empty(n + 1, dtype=prev.dtype)
+        for i in range(1, ref_ids.shape[0] + 1):
+            curr[0] = i
+            ref_id = ref_ids[i - 1]
+            for j in range(1, n + 1):
+                if ref_id == hyp_ids[j - 1]:
+                    curr[j] = prev[j - 1]
+                else:
+                    curr[j] = min(prev[j], curr[j - 1], prev[j - 1]) + 1
+            prev, curr = curr, prev
+        return prev[n]
+
+
+def _intern_tokens(ref_seq, hyp_seq) -> Tuple[List[int], List[int]]:
+    """Map tokens to small integer ids so the DP compares ints instead of strings."""
+    vocab = {}
+    ref_ids = [vocab.setdefault(token, len(vocab)) for token in ref_seq]
+    hyp_ids = [vocab.setdefault(token, len(vocab)) for token in hyp_seq]
+    return ref_ids, hyp_ids
+
+
+def _edit_distance(ref_seq, hyp_seq) -> int:
+    """Levenshtein distance between two sequences (strings or token lists)."""
+    if HAS_RAPIDFUZZ:
+        return Levenshtein.distance(ref_seq, hyp_seq)
+
+    # A shared prefix/suffix never contributes edits; trim it to shrink the DP table
+    start = 0
+    ref_end, hyp_end = len(ref_seq), len(hyp_seq)
+    while start < ref_end and start < hyp_end and ref_seq[start] == hyp_seq[start]:
+        start += 1
+    while ref_end > start and hyp_end > start and ref_seq[ref_end-1] == hyp_seq[hyp_end-1]:
+        ref_end -= 1
+        hyp_end -= 1
+    ref_seq = ref_seq[start:ref_end]
+    hyp_seq = hyp_seq[start:hyp_end]
+
+    if not ref_seq or not hyp_seq:
+        return len(ref_seq) + len(hyp_seq)
+
+    if HAS_NUMBA:
+        ref_ids, hyp_ids = _intern_tokens(ref_seq, hyp_seq)
+        return int(_levenshtein_ids(np.array(ref_ids, dtype=np.int32),
+                                    np.array(hyp_ids, dtype=np.int32)))
+
+    # Simple Levenshtein distance
+    d = [[0] * (len(hyp_seq) + 1) for _ in range(len(ref_seq) + 1)]
+
+    for i in range(len(ref_seq) + 1):
+        d[i][0] = i
+    for j in range(len(hyp_seq) + 1):
+        d[0][j] = j
+
+    for i in range(1, len(ref_seq) + 1):
+        for j in range(1, len(hyp_seq) + 1):
+            if ref_seq[i-1] == hyp_seq[j-1]:
+                d[i][j] = d[i-1][j-1]
+            else:
+                d[i][j] = min(d[i-1][j], d[i][j-1], d[i-1][j-1]) + 1
+
+    return d[len(ref_seq)][len(hyp_seq)]
+
+
+@lru_cache(maxsize=8)
+def _reference_tokens(reference: str) -> Tuple[str, Tuple[str, ...]]:
+    """Lowercased reference text and its words; cached since every model is scored against it."""
+    ref_lower = reference.lower()
+    return ref_lower, tuple(ref_lower.split())
+
+
+def calculate_wer(reference: str, hypothesis: str) -> float:
+    """Calculate Word Error Rate (WER)."""
+    _, ref_words = _reference_tokens(reference)
+    hyp_words = hypothesis.lower().split()
+
+    if len(ref_words) == 0:
+        return 1.0 if len(hyp_words) > 0 else 0.0
+
+    # Fast paths: identical output (e.g. re-runs of the same model) or no output at all
+    if hyp_words == list(ref_words):
+        return 0.0
+    if not hyp_words:
+        return 1.0
+
+    ref_ids, hyp_ids = _intern_tokens(ref_words, hyp_words)
+    return _edit_distance(ref_ids, hyp_ids) / len(ref_words)
+
+
+def calculate_wer_batch(reference: str, hypotheses: List[str]) -> List[float]:
+    """Calculate WER for several hypotheses against the same reference."""
+    _, ref_words = _reference_tokens(reference)
+
+    if not hypotheses:
+        return []
+    if not HAS_RAPIDFUZZ or len(ref_words) == 0:
+        return [calculate_wer(reference, hypothesis) for hypothesis in hypotheses]
+
+    # Intern every hypothesis against one shared vocabulary, then let rapidfuzz
+    # score them on native threads across all cores
+    vocab = {}
+    ref_ids = [vocab.setdefault(word, len(vocab)) for word in ref_words]
+    hyp_ids = [
+        [vocab.setdefault(word, len(vocab)) for word in hypothesis.lower().split()]
+        for hypothesis in hypotheses
+    ]
+    distances = process.cdist(hyp_ids, [ref_ids], scorer=Levenshtein.distance, workers=-1)
+    return [float(distance) / len(ref_words) for distance in distances[:, 0]]
+
+
+def calculate_cer(reference: str, hypothesis: str) -> float:
+    """Calculate Character Error Rate (CER)."""
+    ref_chars, _ = _reference_tokens(reference)
+    hyp_chars = hypothesis.lower()
+
+    if len(ref_chars) == 0:
+        return 1.0 if len(hyp_chars) > 0 else 0.0
+
+    if hyp_chars == ref_chars:
+        return 0.0
+    if not hyp_chars:
+        return 1.0
+
+    # Strings are passed directly so rapidfuzz can use its bit-parallel kernels
+    return _edit_distance(ref_chars, hyp_chars) / len(ref_chars)
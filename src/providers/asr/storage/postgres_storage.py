@@ -5,7 +5,7 @@ PostgreSQL storage for ASR evaluation results.
 import json
 import uuid
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
@@ -285,6 +285,80 @@ class PostgreSQLStorage:
         
         return [dict(row) for row in results]
     
+    def get_leaderboard_with_stats(self,
+                                   dataset_name: str,
+                                   limit: int = 50) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Get leaderboard data and dataset statistics in a single round-trip.
+        
+        Args:
+            dataset_name: Dataset to rank models on
+            limit: Maximum number of leaderboard entries
+            
+        Returns:
+            Tuple of (leaderboard entries, dataset statistics), shaped like
+            get_leaderboard() and get_dataset_stats()
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        
+        # Stats columns are prefixed so they don't collide with leaderboard columns;
+        # the LEFT JOIN keeps the stats row even when no model has been evaluated
+        cursor.execute("""
+            WITH scoped AS (
+                SELECT r.*
+                FROM asr_responses r
+                JOIN asr_experiments e ON r.experiment_id = e.experiment_id
+                WHERE e.dataset_name = %s
+            ),
+            lb AS (
+                SELECT 
+                    model_name,
+                    model_version,
+                    model_type,
+                    AVG(wer) as avg_wer,
+                    AVG(cer) as avg_cer,
+                    AVG(processing_time) as avg_processing_time,
+                    COUNT(*) as evaluation_count,
+                    MIN(wer) as best_wer,
+                    MAX(created_at) as last_evaluation
+                FROM scoped
+                GROUP BY model_name, model_version, model_type
+                ORDER BY avg_wer ASC
+                LIMIT %s
+            ),
+            st AS (
+                SELECT 
+                    COUNT(DISTINCT model_name) as stats_unique_models,
+                    COUNT(*) as stats_total_evaluations,
+                    AVG(wer) as stats_avg_wer,
+                    MIN(wer) as stats_best_wer,
+                    MAX(wer) as stats_worst_wer,
+                    AVG(processing_time) as stats_avg_processing_time
+                FROM scoped
+            )
+            SELECT st.*, lb.*
+            FROM st LEFT JOIN lb ON TRUE
+            ORDER BY lb.avg_wer ASC
+        """, (dataset_name, limit))
+        
+        rows = cursor.fetchall()
+        cursor.close()
+        
+        if not rows:
+            return [], {}
+        
+        stats = {
+            key[len("stats_"):]: value
+            for key, value in rows[0].items() if key.startswith("stats_")
+        }
+        leaderboard = [
+            {key: value for key, value in row.items() if not key.startswith("stats_")}
+            for row in rows if row["model_name"] is not None
+        ]
+        
+        return leaderboard, stats
+    
     def get_experiment_results(self, experiment_id: str) -> List[Dict[str, Any]]:
         """Get all results for a specific experiment."""
         conn = self._get_connection()
@@ -13,6 +13,19 @@ from typing import List, Optional, Dict, Any, Union
 from pathlib import Path
 from datetime import timedelta
 
+# Compiled once at import; _split_into_sentences runs for every transcript
+_WHITESPACE_RE = re.compile(r'\s+')
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+
+def format_timestamp(seconds: float, separator: str = ',') -> str:
+    """Format seconds as HH:MM:SS<separator>mmm, rounded to the nearest millisecond."""
+    hours, rem = divmod(round(seconds * 1000), 3_600_000)
+    minutes, rem = divmod(rem, 60_000)
+    secs, milliseconds = divmod(rem, 1000)
+    
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{milliseconds:03d}"
+
 
 @dataclass
 class TimedSegment:
@@ -141,10 +154,10 @@ class SubtitleProcessor:
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences for subtitle timing."""
         # Clean up the text
-        text = re.sub(r'\s+', ' ', text.strip())
+        text = _WHITESPACE_RE.sub(' ', text.strip())
         
         # Split on sentence boundaries
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENTENCE_END_RE.split(text)
         
         # Filter out empty sentences and clean up
         sentences = [s.strip() for s in sentences if s.strip()]
@@ -246,13 +259,7 @@ class SubtitleProcessor:
     
     def format_time_srt(self, seconds: float) -> str:
         """Format time for SRT subtitle format (HH:MM:SS,mmm)."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        milliseconds = int((secs % 1) * 1000)
-        secs = int(secs)
-        
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+        return format_timestamp(seconds)
     
     def generate_ass_subtitle(self, subtitle_segments: List[SubtitleSegment], 
                             title: str = "Generated Subtitles") -> str:
@@ -312,19 +319,15 @@ class SubtitleProcessor:
         Returns:
             SRT format subtitle content as string
         """
-        lines = []
+        texts = [segment.text.replace('\\N', '\n') for segment in subtitle_segments]  # Convert ASS line breaks to SRT
         
-        for i, segment in enumerate(subtitle_segments, 1):
-            start_time = self.format_time_srt(segment.start_time)
-            end_time = self.format_time_srt(segment.end_time)
-            text = segment.text.replace('\\N', '\n')  # Convert ASS line breaks to SRT
-            
-            lines.append(str(i))
-            lines.append(f"{start_time} --> {end_time}")
-            lines.append(text)
-            lines.append("")  # Empty line between subtitles
+        # Trailing newline on each block leaves an empty line between subtitles
+        blocks = [
+            f"{i}\n{format_timestamp(segment.start_time)} --> {format_timestamp(segment.end_time)}\n{text}\n"
+            for i, (segment, text) in enumerate(zip(subtitle_segments, texts), 1)
+        ]
         
-        return '\n'.join(lines)
+        return '\n'.join(blocks)
     
     def generate_vtt_subtitle(self, subtitle_segments: List[SubtitleSegment]) -> str:
         """
@@ -336,18 +339,15 @@ class SubtitleProcessor:
         Returns:
             WebVTT format subtitle content as string
         """
-        lines = ["WEBVTT", ""]
+        texts = [segment.text.replace('\\N', '\n') for segment in subtitle_segments]
         
-        for i, segment in enumerate(subtitle_segments, 1):
-            start_time = self.format_time_srt(segment.start_time).replace(',', '.')
-            end_time = self.format_time_srt(segment.end_time).replace(',', '.')
-            text = segment.text.replace('\\N', '\n')
-            
-            lines.append(f"{start_time} --> {end_time}")
-            lines.append(text)
-            lines.append("")
+        blocks = ["WEBVTT\n"]
+        blocks.extend(
+            f"{format_timestamp(segment.start_time, '.')} --> {format_timestamp(segment.end_time, '.')}\n{text}\n"
+            for segment, text in zip(subtitle_segments, texts)
+        )
         
-        return '\n'.join(lines)
+        return '\n'.join(blocks)
     
     def process_transcript_to_subtitles(self, transcript: str, audio_duration: float,
                                       output_formats: List[str] = None) -> Dict[str, str]:
@@ -406,7 +406,7 @@ class SubtitleProcessor:
         for format_name, content in subtitle_content.items():
             file_path = base_path / f"{filename_base}.{format_name}"
             
-            with open(file_path, 'w', encoding='utf-8') as f:
+            with open(file_path, 'w', encoding='utf-8', buffering=65536) as f:
                 f.write(content)
             
             saved_files[format_name] = file_path
@@ -14,6 +14,12 @@ from typing import List, Dict, Any, Optional, Union, Tuple
 from dataclasses import dataclass
 import logging
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -63,13 +69,8 @@ class VideoRemuxer:
             raise RuntimeError("FFmpeg not found. Please install FFmpeg and ensure it's in PATH.")
     
     def _check_ffmpeg_available(self) -> bool:
-        """Check if FFmpeg is available."""
-        try:
-            result = subprocess.run([self.ffmpeg_path, "-version"], 
-                                  capture_output=True, text=True, timeout=10)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+        """Check if FFmpeg is available (PATH lookup, no process spawn)."""
+        return shutil.which(self.ffmpeg_path) is not None
     
     def get_video_info(self, video_path: Union[str, Path]) -> VideoInfo:
         """
@@ -86,13 +87,14 @@ class VideoRemuxer:
         if not video_path.exists():
             raise FileNotFoundError(f"Video file not found: {video_path}")
         
-        # Use ffprobe to get video information
+        # Use ffprobe to get video information, limited to the fields parsed below
         cmd = [
             self.ffprobe_path,
             "-v", "quiet",
             "-print_format", "json",
-            "-show_format",
-            "-show_streams",
+            "-show_entries",
+            "format=duration,bit_rate,size,format_name"
+            ":stream=codec_type,codec_name,width,height,r_frame_rate",
             str(video_path)
         ]
         
@@ -102,7 +104,7 @@ class VideoRemuxer:
             if result.returncode != 0:
                 raise RuntimeError(f"ffprobe failed: {result.stderr}")
             
-            data = json.loads(result.stdout)
+            data = orjson.loads(result.stdout) if HAS_ORJSON else json.loads(result.stdout)
             
             # Extract video stream info
             video_stream = None
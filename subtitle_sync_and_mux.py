@@ -15,6 +15,12 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import timedelta
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings("ignore")
 
@@ -22,6 +28,7 @@ warnings.filterwarnings("ignore")
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+from src.subtitle_processor import format_timestamp
 from src.video_remuxer import VideoRemuxer
 
 @dataclass
@@ -39,48 +46,45 @@ class SubtitleFormatter:
     @staticmethod
     def seconds_to_srt_time(seconds: float) -> str:
         """Convert seconds to SRT time format (HH:MM:SS,mmm)"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millisecs = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
+        return format_timestamp(seconds, ",")
 
     @staticmethod
     def seconds_to_vtt_time(seconds: float) -> str:
         """Convert seconds to VTT time format (HH:MM:SS.mmm)"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millisecs = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millisecs:03d}"
+        return format_timestamp(seconds, ".")
+
+    def generate_formats(self, entries: List[SubtitleEntry], formats: List[str]) -> Dict[str, str]:
+        """Generate the requested subtitle formats (srt, vtt) in a single pass over the entries"""
+        formats = {format_type.lower() for format_type in formats}
+        want_srt = "srt" in formats
+        want_vtt = "vtt" in formats
+
+        # Timestamps are computed once; VTT only differs by the millisecond separator
+        starts = [format_timestamp(entry.start_time) for entry in entries]
+        ends = [format_timestamp(entry.end_time) for entry in entries]
+
+        srt_blocks = []
+        vtt_blocks = ["WEBVTT\n"]
+        for entry, start, end in zip(entries, starts, ends):
+            if want_srt:
+                srt_blocks.append(f"{entry.index}\n{start} --> {end}\n{entry.text}\n")
+            if want_vtt:
+                vtt_blocks.append(f"{start.replace(',', '.')} --> {end.replace(',', '.')}\n{entry.text}\n")
+
+        contents = {}
+        if want_srt:
+            contents["srt"] = "\n".join(srt_blocks)
+        if want_vtt:
+            contents["vtt"] = "\n".join(vtt_blocks)
+        return contents
 
     def generate_srt(self, entries: List[SubtitleEntry]) -> str:
         """Generate SRT format subtitles"""
-        srt_content = []
-        for entry in entries:
-            start_time = self.seconds_to_srt_time(entry.start_time)
-            end_time = self.seconds_to_srt_time(entry.end_time)
-
-            srt_content.append(f"{entry.index}")
-            srt_content.append(f"{start_time} --> {end_time}")
-            srt_content.append(entry.text)
-            srt_content.append("")  # Empty line between entries
-
-        return "\n".join(srt_content)
+        return self.generate_formats(entries, ["srt"])["srt"]
 
     def generate_vtt(self, entries: List[SubtitleEntry]) -> str:
         """Generate WebVTT format subtitles"""
-        vtt_content = ["WEBVTT", ""]
-
-        for entry in entries:
-            start_time = self.seconds_to_vtt_time(entry.start_time)
-            end_time = self.seconds_to_vtt_time(entry.end_time)
-
-            vtt_content.append(f"{start_time} --> {end_time}")
-            vtt_content.append(entry.text)
-            vtt_content.append("")
-
-        return "\n".join(vtt_content)
+        return self.generate_formats(entries, ["vtt"])["vtt"]
 
 class SubtitleSynchronizer:
     """Synchronizes transcript segments with video timing"""
@@ -350,8 +354,11 @@ def sync_and_mux_subtitles(video_path: Path, segments_path: Path, output_dir: Pa
 
     # Load segments data
     try:
-        with open(segments_path, 'r', encoding='utf-8') as f:
-            segments_data = json.load(f)
+        if HAS_ORJSON:
+            segments_data = orjson.loads(segments_path.read_bytes())
+        else:
+            with open(segments_path, 'r', encoding='utf-8') as f:
+                segments_data = json.load(f)
         print(f"✅ Loaded transcript segments: {len(segments_data.get('segments', []))} segments")
     except Exception as e:
         print(f"❌ Failed to load segments: {e}")
@@ -377,20 +384,17 @@ def sync_and_mux_subtitles(video_path: Path, segments_path: Path, output_dir: Pa
     subtitle_files = {}
 
     base_name = video_path.stem
+    contents = formatter.generate_formats(subtitle_entries, subtitle_formats)
 
     for format_type in subtitle_formats:
         try:
-            if format_type.lower() == "srt":
-                content = formatter.generate_srt(subtitle_entries)
-                subtitle_path = output_dir / f"{base_name}.srt"
-            elif format_type.lower() == "vtt":
-                content = formatter.generate_vtt(subtitle_entries)
-                subtitle_path = output_dir / f"{base_name}.vtt"
-            else:
+            content = contents.get(format_type.lower())
+            if content is None:
                 print(f"⚠️  Unsupported subtitle format: {format_type}")
                 continue
+            subtitle_path = output_dir / f"{base_name}.{format_type.lower()}"
 
-            with open(subtitle_path, 'w', encoding='utf-8') as f:
+            with open(subtitle_path, 'w', encoding='utf-8', buffering=65536) as f:
                 f.write(content)
 
             subtitle_files[format_type] = subtitle_path
@@ -0,0 +1,152 @@
+"""
+Unit tests for the WER/CER metric helpers.
+"""
+
+import random
+
+import pytest
+
+from src.providers.asr.metrics import error_rates
+from src.providers.asr.metrics.error_rates import (
+    _edit_distance, calculate_cer, calculate_wer, calculate_wer_batch
+)
+
+
+def reference_distance(ref_seq, hyp_seq):
+    """Textbook full-matrix Levenshtein distance, used as the oracle."""
+    d = [[0] * (len(hyp_seq) + 1) for _ in range(len(ref_seq) + 1)]
+    for i in range(len(ref_seq) + 1):
+        d[i][0] = i
+    for j in range(len(hyp_seq) + 1):
+        d[0][j] = j
+    for i in range(1, len(ref_seq) + 1):
+        for j in range(1, len(hyp_seq) + 1):
+            cost = 0 if ref_seq[i-1] == hyp_seq[j-1] else 1
+            d[i][j] = min(d[i-1][j] + 1, d[i][j-1] + 1, d[i-1][j-1] + cost)
+    return d[len(ref_seq)][len(hyp_seq)]
+
+
+@pytest.fixture(params=["rapidfuzz", "numba", "python"])
+def backend(request, monkeypatch):
+    """Force _edit_distance onto one backend, skipping those not installed."""
+    if request.param == "rapidfuzz" and not error_rates.HAS_RAPIDFUZZ:
+        pytest.skip("rapidfuzz not installed")
+    if request.param == "numba" and not error_rates.HAS_NUMBA:
+        pytest.skip("numba not installed")
+
+    if request.param != "rapidfuzz":
+        monkeypatch.setattr(error_rates, "HAS_RAPIDFUZZ", False)
+    if request.param == "python":
+        monkeypatch.setattr(error_rates, "HAS_NUMBA", False)
+    return request.param
+
+
+def random_pairs(count=200, alphabet="abcd", max_len=12, seed=1234):
+    """Short random sequence pairs; a small alphabet makes shared prefixes/suffixes common."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        ref = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len)))
+        hyp = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len)))
+        yield ref, hyp
+
+
+class TestEditDistance:
+    """Test every backend agrees with the reference DP."""
+
+    def test_strings_match_reference(self, backend):
+        """Test character sequences, including empty and affix-sharing pairs."""
+        for ref, hyp in random_pairs():
+            assert _edit_distance(ref, hyp) == reference_distance(ref, hyp), (ref, hyp)
+
+    def test_token_ids_match_reference(self, backend):
+        """Test interned integer token sequences as used by calculate_wer."""
+        for ref, hyp in random_pairs(seed=99):
+            ref_ids, hyp_ids = [ord(c) for c in ref], [ord(c) for c in hyp]
+            assert _edit_distance(ref_ids, hyp_ids) == reference_distance(ref, hyp), (ref, hyp)
+
+    def test_known_distances(self, backend):
+        """Test classic examples."""
+        assert _edit_distance("kitten", "sitting") == 3
+        assert _edit_distance("flaw", "lawn") == 2
+        assert _edit_distance("", "abc") == 3
+        assert _edit_distance("abc", "abc") == 0
+
+
+class TestCalculateWer:
+    """Test calculate_wer and its fast paths."""
+
+    def test_identical_hypothesis(self, backend):
+        """Test identical text (ignoring case and spacing) scores zero."""
+        assert calculate_wer("The quick brown fox", "the  quick brown FOX") == 0.0
+
+    def test_empty_hypothesis(self, backend):
+        """Test an empty hypothesis deletes every reference word."""
+        assert calculate_wer("the quick brown fox", "") == 1.0
+        assert calculate_wer("the quick brown fox", "   ") == 1.0
+
+    def test_empty_reference(self, backend):
+        """Test an empty reference scores 0 for empty output and 1 otherwise."""
+        assert calculate_wer("", "") == 0.0
+        assert calculate_wer("", "anything") == 1.0
+
+    def test_substitution_insertion_deletion(self, backend):
+        """Test WER is the word-level edit distance over the reference length."""
+        reference = "the quick brown fox jumps"
+        assert calculate_wer(reference, "the quick red fox jumps") == pytest.approx(1 / 5)
+        assert calculate_wer(reference, "the quick brown fox jumps high") == pytest.approx(1 / 5)
+        assert calculate_wer(reference, "quick brown fox") == pytest.approx(2 / 5)
+
+    def test_matches_reference_dp(self, backend):
+        """Test random word sequences against the reference DP."""
+        for ref, hyp in random_pairs(alphabet="xyz", seed=7):
+            ref_text, hyp_text = " ".join(ref), " ".join(hyp)
+            expected = (reference_distance(ref, hyp) / len(ref)) if ref else (1.0 if hyp else 0.0)
+            assert calculate_wer(ref_text, hyp_text) == pytest.approx(expected), (ref, hyp)
+
+
+class TestCalculateWerBatch:
+    """Test calculate_wer_batch matches per-hypothesis calculate_wer."""
+
+    def test_batch_equals_individual(self, backend):
+        """Test mixed hypotheses, including identical and empty ones."""
+        reference = "the quick brown fox jumps over the lazy dog"
+        hypotheses = [
+            reference,
+            "",
+            "the quick brown fox",
+            "a quick brown cat jumps over the lazy dog today",
+            "THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG",
+            "dog lazy the over jumps fox brown quick the",
+        ]
+        batch = calculate_wer_batch(reference, hypotheses)
+        assert batch == pytest.approx([calculate_wer(reference, h) for h in hypotheses])
+
+    def test_random_batch(self, backend):
+        """Test a larger random batch against the reference DP."""
+        reference = " ".join("abcabcabca")
+        hypotheses = [" ".join(hyp) for _, hyp in random_pairs(count=50, alphabet="abc", seed=3)]
+        expected = [reference_distance(reference.split(), h.split()) / 10 for h in hypotheses]
+        assert calculate_wer_batch(reference, hypotheses) == pytest.approx(expected)
+
+    def test_empty_inputs(self, backend):
+        """Test no hypotheses and an empty reference."""
+        assert calculate_wer_batch("some words", []) == []
+        assert calculate_wer_batch("", ["", "words"]) == [0.0, 1.0]
+
+
+class TestCalculateCer:
+    """Test calculate_cer and its fast paths."""
+
+    def test_fast_paths(self, backend):
+        """Test identical, empty-hypothesis and empty-reference cases."""
+        assert calculate_cer("Hello World", "hello world") == 0.0
+        assert calculate_cer("hello", "") == 1.0
+        assert calculate_cer("", "") == 0.0
+        assert calculate_cer("", "x") == 1.0
+
+    def test_exact_rate(self, backend):
+        """Test CER is the character edit distance over reference length."""
+        assert calculate_cer("kitten", "sitting") == pytest.approx(3 / 6)
+        assert calculate_cer("abcdefghijklmnopqrst", "zyxwvutsrqponmlkjihg") == pytest.approx(
+            reference_distance("abcdefghijklmnopqrst", "zyxwvutsrqponmlkjihg") / 20
+        )
@@ -12,6 +12,12 @@ from asr_evaluation.adapters.faster_whisper_adapter import FasterWhisperAdapter
 from asr_evaluation.core.interfaces import TranscriptionResult, ModelInfo
 
 
+@pytest.fixture(scope="session")
+def tiny_adapter():
+    """Share one tiny adapter so the model is loaded at most once per session."""
+    return FasterWhisperAdapter(model_size="tiny")
+
+
 class TestModelAvailability:
     """Test that models are available and can be loaded."""
     
@@ -30,10 +36,9 @@ class TestModelAvailability:
         assert adapter.model_size == "tiny"
         assert adapter.device == "cpu"
     
-    def test_model_info(self):
+    def test_model_info(self, tiny_adapter):
         """Test that model info is returned correctly."""
-        adapter = FasterWhisperAdapter(model_size="tiny")
-        info = adapter.get_model_info()
+        info = tiny_adapter.get_model_info()
         
         assert isinstance(info, ModelInfo)
         assert info.name == "faster-whisper"
@@ -42,12 +47,10 @@ class TestModelAvailability:
         assert info.supports_confidence is True
         assert info.supports_timestamps is True
     
-    def test_model_availability_check(self):
+    def test_model_availability_check(self, tiny_adapter):
         """Test that model availability can be checked."""
-        adapter = FasterWhisperAdapter(model_size="tiny")
-        
         # This will download the model if not available
-        is_available = adapter.is_available()
+        is_available = tiny_adapter.is_available()
         
         # Should be True if faster-whisper is installed
         if is_available:
@@ -63,27 +66,31 @@ class TestModelAvailability:
         duration = 3.0
         frequency = 440  # A4 note
         
-        t = np.linspace(0, duration, int(sample_rate * duration))
-        audio_data = 0.3 * np.sin(2 * np.pi * frequency * t)
+        n = np.arange(int(sample_rate * duration), dtype=np.float32)
+        audio_data = (0.3 * np.sin((2 * np.pi * frequency / sample_rate) * n)).astype(np.float32)
         
         # Create temporary file
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            sf.write(tmp_file.name, audio_data, sample_rate)
+            sf.write(tmp_file.name, audio_data, sample_rate, subtype="FLOAT")
             yield tmp_file.name
         
         # Cleanup
         Path(tmp_file.name).unlink(missing_ok=True)
     
-    def test_basic_transcription(self, sample_audio_file):
+    def test_basic_transcription(self, tiny_adapter, sample_audio_file):
         """Test basic transcription functionality."""
-        adapter = FasterWhisperAdapter(model_size="tiny")
-        
         # Skip if model not available
-        if not adapter.is_available():
+        if not tiny_adapter.is_available():
             pytest.skip("Model not available")
         
-        # Transcribe the sample audio
-        result = adapter.transcribe(sample_audio_file)
+        # Transcribe the sample audio; greedy decoding plus VAD keeps Whisper
+        # from decoding hallucinated tokens over the non-speech sine wave
+        result = tiny_adapter.transcribe(
+            sample_audio_file,
+            beam_size=1,
+            vad_filter=True,
+            condition_on_previous_text=False
+        )
         
         # Verify result structure
         assert isinstance(result, TranscriptionResult)
@@ -95,12 +102,10 @@ class TestModelAvailability:
         print(f"Transcription result: '{result.text}'")
         print(f"Processing time: {result.processing_time:.2f}s")
     
-    def test_file_not_found_error(self):
+    def test_file_not_found_error(self, tiny_adapter):
         """Test that FileNotFoundError is raised for missing files."""
-        adapter = FasterWhisperAdapter(model_size="tiny")
-        
         with pytest.raises(FileNotFoundError):
-            adapter.transcribe("nonexistent_file.wav")
+            tiny_adapter.transcribe("nonexistent_file.wav")
 
 
 class TestConfigurationValidation:
@@ -0,0 +1,85 @@
+"""
+Unit tests pinning SRT/VTT timestamp and document formatting.
+"""
+
+import pytest
+
+from src.subtitle_processor import SubtitleProcessor, SubtitleSegment, format_timestamp
+from subtitle_sync_and_mux import SubtitleEntry, SubtitleFormatter
+
+
+class TestFormatTimestamp:
+    """Test the shared HH:MM:SS,mmm formatter."""
+
+    @pytest.mark.parametrize("seconds, expected", [
+        (0, "00:00:00,000"),
+        (1.5, "00:00:01,500"),
+        (59.999, "00:00:59,999"),
+        (61.25, "00:01:01,250"),
+        (3661.007, "01:01:01,007"),
+        (15159.088, "04:12:39,088"),
+        (1.9996, "00:00:02,000"),
+    ])
+    def test_rounds_to_nearest_millisecond(self, seconds, expected):
+        """Test float noise never drops a millisecond and carries propagate."""
+        assert format_timestamp(seconds) == expected
+
+    def test_vtt_separator(self):
+        """Test VTT uses a dot before the milliseconds."""
+        assert format_timestamp(3661.5, ".") == "01:01:01.500"
+
+    def test_scalar_helpers_agree(self):
+        """Test the per-call helpers match the shared formatter."""
+        for seconds in (0.001, 12.345, 15159.088, 7322.1):
+            assert SubtitleProcessor().format_time_srt(seconds) == format_timestamp(seconds)
+            assert SubtitleFormatter.seconds_to_srt_time(seconds) == format_timestamp(seconds)
+            assert SubtitleFormatter.seconds_to_vtt_time(seconds) == format_timestamp(seconds, ".")
+
+
+class TestSubtitleDocuments:
+    """Test full SRT/VTT documents are byte-for-byte stable."""
+
+    def test_subtitle_processor_srt_and_vtt(self):
+        """Test SubtitleProcessor output, including ASS line-break conversion."""
+        segments = [
+            SubtitleSegment(start_time=0.0, end_time=2.5, text="Hello"),
+            SubtitleSegment(start_time=15159.088, end_time=15161.2, text="Line one\\NLine two"),
+        ]
+        processor = SubtitleProcessor()
+
+        assert processor.generate_srt_subtitle(segments) == (
+            "1\n00:00:00,000 --> 00:00:02,500\nHello\n"
+            "\n"
+            "2\n04:12:39,088 --> 04:12:41,200\nLine one\nLine two\n"
+        )
+        assert processor.generate_vtt_subtitle(segments) == (
+            "WEBVTT\n"
+            "\n"
+            "00:00:00.000 --> 00:00:02.500\nHello\n"
+            "\n"
+            "04:12:39.088 --> 04:12:41.200\nLine one\nLine two\n"
+        )
+
+    def test_subtitle_formatter_formats(self):
+        """Test SubtitleFormatter produces the same documents in one pass or separately."""
+        entries = [
+            SubtitleEntry(start_time=1.0, end_time=3.25, text="First", index=1),
+            SubtitleEntry(start_time=3661.007, end_time=3662.0, text="Second", index=2),
+        ]
+        formatter = SubtitleFormatter()
+        contents = formatter.generate_formats(entries, ["SRT", "vtt"])
+
+        assert contents["srt"] == (
+            "1\n00:00:01,000 --> 00:00:03,250\nFirst\n"
+            "\n"
+            "2\n01:01:01,007 --> 01:01:02,000\nSecond\n"
+        )
+        assert contents["vtt"] == (
+            "WEBVTT\n"
+            "\n"
+            "00:00:01.000 --> 00:00:03.250\nFirst\n"
+            "\n"
+            "01:01:01.007 --> 01:01:02.000\nSecond\n"
+        )
+        assert formatter.generate_srt(entries) == contents["srt"]
+        assert formatter.generate_vtt(entries) == contents["vtt"]
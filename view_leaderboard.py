@@ -5,12 +5,17 @@ View ASR Model Leaderboard from PostgreSQL Database
 
 import sys
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Add the project root to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from asr_evaluation.storage.postgres_storage import PostgreSQLStorage
+from src.providers.asr.storage.postgres_storage import PostgreSQLStorage
+
+
+def _format_value(value, spec: str, suffix: str = "") -> str:
+    """Format a nullable numeric column, showing N/A for missing values."""
+    return "N/A" if value is None else format(value, spec) + suffix
 
 
 def print_leaderboard(results: List[Dict[str, Any]]):
@@ -23,23 +28,26 @@ def print_leaderboard(results: List[Dict[str, Any]]):
         print("No results found in database!")
         return
     
-    # Print header
-    print(f"{'Rank':<4} {'Model':<25} {'Version':<15} {'Type':<8} {'Avg WER':<8} {'Best WER':<8} {'Avg CER':<8} {'Evals':<6} {'Avg Time':<8} {'Last Run'}")
-    print("-" * 120)
+    # Build the whole table and emit it with a single write
+    lines = [
+        f"{'Rank':<4} {'Model':<25} {'Version':<15} {'Type':<8} {'Avg WER':<8} {'Best WER':<8} {'Avg CER':<8} {'Evals':<6} {'Avg Time':<8} {'Last Run'}",
+        "-" * 120,
+    ]
     
-    # Print results
     for i, result in enumerate(results, 1):
         model_name = result["model_name"][:24]
         version = result["model_version"][:14] if result["model_version"] else "N/A"
         model_type = result["model_type"][:7] if result["model_type"] else "N/A"
-        avg_wer = f"{result['avg_wer']:.2%}" if result['avg_wer'] is not None else "N/A"
-        best_wer = f"{result['best_wer']:.2%}" if result['best_wer'] is not None else "N/A"
-        avg_cer = f"{result['avg_cer']:.2%}" if result['avg_cer'] is not None else "N/A"
+        avg_wer = _format_value(result['avg_wer'], ".2%")
+        best_wer = _format_value(result['best_wer'], ".2%")
+        avg_cer = _format_value(result['avg_cer'], ".2%")
         eval_count = str(result["evaluation_count"])
-        avg_time = f"{result['avg_processing_time']:.1f}s" if result['avg_processing_time'] is not None else "N/A"
+        avg_time = _format_value(result['avg_processing_time'], ".1f", "s")
         last_run = result["last_evaluation"].strftime("%m/%d %H:%M") if result["last_evaluation"] else "N/A"
         
-        print(f"{i:<4} {model_name:<25} {version:<15} {model_type:<8} {avg_wer:<8} {best_wer:<8} {avg_cer:<8} {eval_count:<6} {avg_time:<8} {last_run}")
+        lines.append(f"{i:<4} {model_name:<25} {version:<15} {model_type:<8} {avg_wer:<8} {best_wer:<8} {avg_cer:<8} {eval_count:<6} {avg_time:<8} {last_run}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_model_details(storage: PostgreSQLStorage, model_name: str):
@@ -68,9 +76,11 @@ def print_model_details(storage: PostgreSQLStorage, model_name: str):
         print(f"{date:<12} {experiment:<25} {wer:<8} {cer:<8} {time_val:<8} {words}")
 
 
-def print_dataset_stats(storage: PostgreSQLStorage, dataset_name: str = "vaporeon_copypasta"):
-    """Print dataset statistics."""
-    stats = storage.get_dataset_stats(dataset_name)
+def print_dataset_stats(storage: PostgreSQLStorage, dataset_name: str = "vaporeon_copypasta",
+                        stats: Optional[Dict[str, Any]] = None):
+    """Print dataset statistics, querying them unless already fetched."""
+    if stats is None:
+        stats = storage.get_dataset_stats(dataset_name)
     
     if not stats:
         print(f"No statistics found for dataset: {dataset_name}")
@@ -118,12 +128,10 @@ def main():
             print("  python view_leaderboard.py stats [dataset]    # Show dataset stats")
             return
     else:
-        # Show leaderboard
-        leaderboard = storage.get_leaderboard(dataset_name="vaporeon_copypasta")
+        # Show leaderboard and quick stats, fetched in one query
+        leaderboard, stats = storage.get_leaderboard_with_stats(dataset_name="vaporeon_copypasta")
         print_leaderboard(leaderboard)
-        
-        # Show quick stats
-        print_dataset_stats(storage)
+        print_dataset_stats(storage, stats=stats)
     
     storage.close()
 
@@ -4,94 +4,228 @@ Wan 2.2 Instagirl Complete Setup Script for ComfyUI
 Downloads all required models, LoRAs, and dependencies for the workflow
 """
 
+import errno
+import hashlib
+import importlib.util
+import mmap
 import os
+import queue
 import shutil
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from huggingface_hub import hf_hub_download
-import requests
-from urllib.parse import urlparse
+
+def enable_hf_transfer():
+    """Enable hf_transfer (parallel chunked HF downloads) unless WAN22_DISABLE_HF_TRANSFER=1"""
+    if os.environ.get("WAN22_DISABLE_HF_TRANSFER") == "1":
+        return
+    
+    if importlib.util.find_spec("hf_transfer") is None:
+        print("Installing hf_transfer for faster Hugging Face downloads...")
+        subprocess.run([sys.executable, "-m", "pip", "install", "hf_transfer"], check=False)
+        importlib.invalidate_caches()
+    
+    # huggingface_hub fails hard if the flag is set without the package, so only set it when importable
+    if importlib.util.find_spec("hf_transfer") is not None:
+        os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
+# Must run before huggingface_hub is imported: it reads the flag at import time
+enable_hf_transfer()
+
+from huggingface_hub import HfApi, hf_hub_download
+from huggingface_hub.utils import disable_progress_bars
+from tqdm import tqdm
+import urllib3
+from urllib.parse import urlencode, urljoin, urlparse
+
+try:
+    import pygit2
+    HAS_PYGIT2 = True
+except ImportError:
+    HAS_PYGIT2 = False
 
 # Base ComfyUI models directory
 BASE_DIR = "/workspace/ComfyUI/models"
 
+def load_civitai_token():
+    """Civitai API token from $CIVITAI_TOKEN, falling back to ~/.config/civitai/token"""
+    token = os.environ.get("CIVITAI_TOKEN")
+    if token:
+        return token.strip()
+    
+    token_file = Path("~/.config/civitai/token").expanduser()
+    if token_file.is_file():
+        return token_file.read_text().strip() or None
+    return None
+
+CIVITAI_TOKEN = load_civitai_token()
+CIVITAI_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Shared connection pool: keep-alive connections are reused across Civitai files and range workers
+_POOL = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=16,
+    retries=urllib3.Retry(total=5, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+
+# One progress bar over all pending bytes, created in main once pre-flight knows the total
+GLOBAL_PBAR = None
+
+# Set by main on Ctrl-C; download loops check it so their threads exit instead of finishing multi-GB files
+STOP = threading.Event()
+
+class DownloadCancelled(Exception):
+    """Raised inside download loops once STOP is set"""
+
+def _check_stop():
+    if STOP.is_set():
+        raise DownloadCancelled("download cancelled")
+
+def _advance_progress(n):
+    """Add n downloaded bytes to the shared progress bar, if one is active"""
+    pbar = GLOBAL_PBAR
+    if pbar is not None:
+        pbar.update(n)
+
+@dataclass(frozen=True, slots=True)
+class Asset:
+    """A model file to download; kind is one of "huggingface", "gguf" or "civitai"."""
+    kind: str
+    target_dir: str
+    final_name: str
+    repo_id: str | None = None
+    filename: str | None = None
+    model_id: str | None = None
+    final_path: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Precomputed once; frozen dataclasses need object.__setattr__
+        object.__setattr__(self, "final_path", os.path.join(self.target_dir, self.final_name))
+
 # Wan 2.2 Instagirl Workflow Requirements
-WAN22_MANIFEST = {
-    "huggingface_models": [
-        # Main Wan 2.1 models (base requirement)
-        {
-            "repo_id": "Comfy-Org/Wan_2.1_ComfyUI_repackaged",
-            "filename": "split_files/text_encoders/umt5_xxl_fp8_e4m3fn_scaled.safetensors",
-            "target_dir": f"{BASE_DIR}/text_encoders",
-            "final_name": "umt5_xxl_fp8_e4m3fn_scaled.safetensors"
-        },
-        {
-            "repo_id": "Comfy-Org/Wan_2.1_ComfyUI_repackaged",
-            "filename": "split_files/vae/wan_2.1_vae.safetensors",
-            "target_dir": f"{BASE_DIR}/vae",
-            "final_name": "wan_2.1_vae.safetensors"
-        },
-        # CFG Step Distillation LoRA
-        {
-            "repo_id": "Kijai/WanVideo_comfy",
-            "filename": "Wan21_T2V_14B_lightx2v_cfg_step_distill_lora_rank32.safetensors",
-            "target_dir": f"{BASE_DIR}/loras",
-            "final_name": "Wan21_T2V_14B_lightx2v_cfg_step_distill_lora_rank32.safetensors"
-        }
-    ],
-    
-    "gguf_models": [
-        # Wan 2.2 GGUF Models (High and Low Noise)
-        {
-            "repo_id": "QuantStack/Wan2.2-T2V-A14B-GGUF",
-            "filename": "HighNoise/Wan2.2-T2V-A14B-HighNoise-Q8_0.gguf",
-            "target_dir": f"{BASE_DIR}/diffusion_models",
-            "final_name": "Wan2.2-T2V-A14B-HighNoise-Q8_0.gguf"
-        },
-        {
-            "repo_id": "QuantStack/Wan2.2-T2V-A14B-GGUF",
-            "filename": "LowNoise/Wan2.2-T2V-A14B-LowNoise-Q8_0.gguf",
-            "target_dir": f"{BASE_DIR}/diffusion_models",
-            "final_name": "Wan2.2-T2V-A14B-LowNoise-Q8_0.gguf"
-        }
-    ],
-    
-    "civitai_models": [
-        # Lenovo Ultrareal LoRA
-        {
-            "model_id": "2066914",
-            "target_dir": f"{BASE_DIR}/loras",
-            "final_name": "Lenovo.safetensors"
-        },
-        # Instagirl LoRAs (High Noise and Low Noise)
-        {
-            "model_id": "2086717",  # This is the ID from your wget command
-            "target_dir": f"{BASE_DIR}/loras",
-            "final_name": "Instagirlv2.0_lownoise.safetensors"
-        }
-    ],
-    
-    "custom_nodes": [
-        {
-            "repo": "https://github.com/giriss/comfy-image-saver",
-            "name": "Image Saver (Seed Generator)"
-        },
-        {
-            "repo": "https://github.com/city96/ComfyUI-GGUF",
-            "name": "GGUF Support (UnetLoaderGGUF)"
-        },
-        {
-            "repo": "https://github.com/ClownsharkBatwing/RES4LYF",
-            "name": "RES4LYF (res_2s sampler)"
-        }
-    ]
-}
+ASSETS: tuple[Asset, ...] = (
+    # Main Wan 2.1 models (base requirement)
+    Asset(
+        kind="huggingface",
+        repo_id="Comfy-Org/Wan_2.1_ComfyUI_repackaged",
+        filename="split_files/text_encoders/umt5_xxl_fp8_e4m3fn_scaled.safetensors",
+        target_dir=f"{BASE_DIR}/text_encoders",
+        final_name="umt5_xxl_fp8_e4m3fn_scaled.safetensors"
+    ),
+    Asset(
+        kind="huggingface",
+        repo_id="Comfy-Org/Wan_2.1_ComfyUI_repackaged",
+        filename="split_files/vae/wan_2.1_vae.safetensors",
+        target_dir=f"{BASE_DIR}/vae",
+        final_name="wan_2.1_vae.safetensors"
+    ),
+    # CFG Step Distillation LoRA
+    Asset(
+        kind="huggingface",
+        repo_id="Kijai/WanVideo_comfy",
+        filename="Wan21_T2V_14B_lightx2v_cfg_step_distill_lora_rank32.safetensors",
+        target_dir=f"{BASE_DIR}/loras",
+        final_name="Wan21_T2V_14B_lightx2v_cfg_step_distill_lora_rank32.safetensors"
+    ),
+    
+    # Wan 2.2 GGUF Models (High and Low Noise)
+    Asset(
+        kind="gguf",
+        repo_id="QuantStack/Wan2.2-T2V-A14B-GGUF",
+        filename="HighNoise/Wan2.2-T2V-A14B-HighNoise-Q8_0.gguf",
+        target_dir=f"{BASE_DIR}/diffusion_models",
+        final_name="Wan2.2-T2V-A14B-HighNoise-Q8_0.gguf"
+    ),
+    Asset(
+        kind="gguf",
+        repo_id="QuantStack/Wan2.2-T2V-A14B-GGUF",
+        filename="LowNoise/Wan2.2-T2V-A14B-LowNoise-Q8_0.gguf",
+        target_dir=f"{BASE_DIR}/diffusion_models",
+        final_name="Wan2.2-T2V-A14B-LowNoise-Q8_0.gguf"
+    ),
+    
+    # Lenovo Ultrareal LoRA
+    Asset(
+        kind="civitai",
+        model_id="2066914",
+        target_dir=f"{BASE_DIR}/loras",
+        final_name="Lenovo.safetensors"
+    ),
+    # Instagirl LoRAs (High Noise and Low Noise)
+    Asset(
+        kind="civitai",
+        model_id="2086717",  # This is the ID from your wget command
+        target_dir=f"{BASE_DIR}/loras",
+        final_name="Instagirlv2.0_lownoise.safetensors"
+    )
+)
+
+CUSTOM_NODES = [
+    {
+        "repo": "https://github.com/giriss/comfy-image-saver",
+        "name": "Image Saver (Seed Generator)"
+    },
+    {
+        "repo": "https://github.com/city96/ComfyUI-GGUF",
+        "name": "GGUF Support (UnetLoaderGGUF)"
+    },
+    {
+        "repo": "https://github.com/ClownsharkBatwing/RES4LYF",
+        "name": "RES4LYF (res_2s sampler)"
+    }
+]
 
+def assets_of(*kinds):
+    """Manifest assets of the given kinds, in manifest order"""
+    return [asset for asset in ASSETS if asset.kind in kinds]
+
+# Names already on disk per target directory, filled by main with one scandir per directory
+PRESENT: dict[str, set[str]] = {}
+
+def is_present(target_dir, name):
+    """True if name exists in target_dir, answered from PRESENT when the directory is indexed"""
+    names = PRESENT.get(target_dir)
+    if names is None:
+        return os.path.exists(os.path.join(target_dir, name))
+    return name in names
+
+def mark_present(target_dir, name):
+    """Record a newly written file so later stages see it without another stat"""
+    if target_dir in PRESENT:
+        PRESENT[target_dir].add(name)
+
+@lru_cache(maxsize=None)
 def ensure_directory(path):
-    """Create directory if it doesn't exist"""
+    """Create directory if it doesn't exist (memoized: each path is created at most once)"""
     Path(path).mkdir(parents=True, exist_ok=True)
 
+def _clone_node(node, node_path):
+    """Shallow clone of a custom node repo, returning an error or None"""
+    if HAS_PYGIT2:
+        # In-process libgit2 clone: no git process spawn or captured output per node
+        try:
+            pygit2.clone_repository(node["repo"], node_path, bare=False, depth=1)
+            return None
+        except (pygit2.GitError, TypeError):
+            # TypeError: pygit2 < 1.14 has no depth argument; GitError: e.g. libgit2
+            # built without HTTPS. Either way, retry with the git CLI from a clean path.
+            shutil.rmtree(node_path, ignore_errors=True)
+    
+    try:
+        subprocess.run(
+            ["git", "clone", "--depth=1", "--filter=blob:none", "--single-branch",
+             node["repo"], node_path],
+            capture_output=True, text=True, check=True
+        )
+        return None
+    except (subprocess.CalledProcessError, OSError) as e:
+        # OSError covers a missing git binary, which should fail this node, not the whole stage
+        return e
+
 def install_custom_nodes():
     """Install required custom nodes"""
     print("=" * 60)
@@ -101,33 +235,231 @@ def install_custom_nodes():
     custom_nodes_dir = "/workspace/ComfyUI/custom_nodes"
     ensure_directory(custom_nodes_dir)
     
-    for node in WAN22_MANIFEST["custom_nodes"]:
+    pending = []
+    for node in CUSTOM_NODES:
         node_name = node["repo"].split("/")[-1]
         node_path = os.path.join(custom_nodes_dir, node_name)
         
         if os.path.exists(node_path):
             print(f"✓ {node['name']} already installed")
             continue
-            
+        
         print(f"Installing {node['name']}...")
+        pending.append((node, node_path))
+    
+    if not pending:
+        return
+    
+    # Clones are independent, so run them all at once
+    with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        errors = list(executor.map(lambda item: _clone_node(*item), pending))
+    
+    requirements_files = []
+    for (node, node_path), error in zip(pending, errors):
+        if error is not None:
+            print(f"✗ Error installing {node['name']}: {error}")
+            continue
+        print(f"✓ Successfully cloned {node['name']}")
+        
+        requirements_path = os.path.join(node_path, "requirements.txt")
+        if os.path.exists(requirements_path):
+            requirements_files.append(requirements_path)
+    
+    # Install all requirements in one pip run so the resolver only runs once
+    if requirements_files and not STOP.is_set():
+        print(f"Installing requirements for {len(requirements_files)} custom nodes...")
+        cmd = [sys.executable, "-m", "pip", "install"]
+        for requirements_path in requirements_files:
+            cmd += ["-r", requirements_path]
+        
         try:
-            result = subprocess.run(
-                ["git", "clone", node["repo"], node_path],
-                capture_output=True, text=True, check=True
-            )
-            print(f"✓ Successfully cloned {node['name']}")
+            subprocess.run(cmd, check=True)
+            print("✓ Custom node requirements installed")
+        except subprocess.CalledProcessError as e:
+            print(f"✗ Error installing custom node requirements: {e}")
+
+class HTTPStatusError(Exception):
+    """An HTTP response with an error status"""
+    
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status} for {urlparse(url).netloc}")
+        self.status = status
+
+def _raise_for_status(response, url):
+    """Raise HTTPStatusError for 4xx/5xx responses (urllib3 does not)"""
+    if response.status >= 400:
+        raise HTTPStatusError(response.status, url)
+
+def _is_server_error(error):
+    """True if an exception carries an HTTP 5xx response"""
+    if isinstance(error, HTTPStatusError):
+        return error.status >= 500
+    # Retry gives up on repeated status_forcelist responses with MaxRetryError(reason=ResponseError)
+    if isinstance(error, urllib3.exceptions.MaxRetryError):
+        return isinstance(error.reason, urllib3.exceptions.ResponseError)
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", 0) >= 500
+
+class AdaptiveWorkerPool:
+    """Thread pool sized by AIMD on measured throughput instead of a fixed worker count
+    
+    Starts at WAN22_MIN_WORKERS (default 2) workers. Every `window` seconds a monitor thread
+    compares the bytes reported via add_bytes() with the previous window: a rise of more than 5%
+    adds one worker (up to WAN22_MAX_WORKERS, capped at 16); a drop of more than 5% or any 5xx
+    halves the target, and surplus workers retire after their current item.
+    
+    AIMD needs a steady byte signal, so pass `workers` for a fixed-size pool when progress is
+    only known per finished item. Once any item raises, no further items are started.
+    """
+    
+    def __init__(self, func, items, window=5.0, workers=None):
+        self.func = func
+        self.window = window
+        if workers is not None:
+            self.min_workers = self.max_workers = max(1, workers)
+        else:
+            self.min_workers = max(1, int(os.getenv("WAN22_MIN_WORKERS", "2")))
+            self.max_workers = max(self.min_workers, min(16, int(os.getenv("WAN22_MAX_WORKERS", "16"))))
+        
+        self.pending = queue.Queue()
+        for item in items:
+            self.pending.put(item)
+        
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.bytes_done = 0
+        self.server_error = False
+        self.failed = False
+        self.target = self.min_workers
+        self.active = 0
+        self.results = []
+    
+    def add_bytes(self, n):
+        with self.lock:
+            self.bytes_done += n
+    
+    def report_server_error(self):
+        with self.lock:
+            self.server_error = True
+    
+    def _spawn(self):
+        self.active += 1
+        threading.Thread(target=self._worker, daemon=True).start()
+    
+    def _retire(self):
+        self.active -= 1
+        if self.active == 0:
+            self.done.set()
+    
+    def _worker(self):
+        while True:
+            with self.lock:
+                if self.active > self.target or self.failed or STOP.is_set():
+                    self._retire()
+                    return
+                try:
+                    item = self.pending.get_nowait()
+                except queue.Empty:
+                    self._retire()
+                    return
             
-            # Install requirements if they exist
-            requirements_path = os.path.join(node_path, "requirements.txt")
-            if os.path.exists(requirements_path):
-                print(f"Installing requirements for {node['name']}...")
-                subprocess.run([
-                    sys.executable, "-m", "pip", "install", "-r", requirements_path
-                ], check=True)
-                print(f"✓ Requirements installed for {node['name']}")
+            try:
+                result = self.func(item, self)
+            except Exception as e:
+                if _is_server_error(e):
+                    self.report_server_error()
+                # One failed item already dooms the caller (e.g. a missing range), so stop taking work
+                self.failed = True
+                result = e
+            with self.lock:
+                self.results.append((item, result))
+    
+    def _monitor(self):
+        prev_bps = 0.0
+        last_bytes = 0
+        while not self.done.wait(self.window):
+            with self.lock:
+                bps = (self.bytes_done - last_bytes) / self.window
+                last_bytes = self.bytes_done
                 
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Error installing {node['name']}: {e}")
+                if self.server_error or bps < prev_bps * 0.95:
+                    self.target = max(self.min_workers, self.target // 2)
+                elif bps > prev_bps * 1.05 and self.target < self.max_workers and not self.pending.empty():
+                    self.target += 1
+                    self._spawn()
+                
+                self.server_error = False
+            prev_bps = bps
+    
+    def run(self, abandon_on_stop=False):
+        """Process every item and return (item, result_or_exception) pairs in completion order
+        
+        Once STOP is set, no new items are started. With abandon_on_stop, run() also raises
+        DownloadCancelled right away instead of waiting for in-flight items; only use it when
+        workers share no resources with the caller (e.g. hf_hub_download, which cannot be
+        interrupted and is left to die with its daemon thread).
+        """
+        if self.pending.empty():
+            return []
+        
+        with self.lock:
+            for _ in range(self.target):
+                self._spawn()
+        if self.min_workers < self.max_workers:
+            threading.Thread(target=self._monitor, daemon=True).start()
+        
+        while not self.done.wait(0.5):
+            if abandon_on_stop and STOP.is_set():
+                raise DownloadCancelled("download cancelled")
+        return self.results
+
+def _fetch_hf_file(asset, pool=None):
+    """Download a single Hugging Face asset, returning (ok, message)"""
+    target_path = asset.final_path
+    
+    if is_present(asset.target_dir, asset.final_name):
+        return True, f"✓ Already exists: {asset.final_name}"
+        
+    print(f"Downloading {asset.filename}...")
+    
+    try:
+        # Download straight into the target directory instead of the HF cache,
+        # so multi-GB files are never copied a second time
+        downloaded_path = hf_hub_download(
+            repo_id=asset.repo_id,
+            filename=asset.filename,
+            local_dir=asset.target_dir,
+            local_dir_use_symlinks=False,
+            resume_download=True
+        )
+        
+        # Repo subfolders (e.g. split_files/vae/) are kept under local_dir; a same-filesystem
+        # rename to final_name is metadata-only and prunes the emptied subfolders
+        if os.path.abspath(downloaded_path) != os.path.abspath(target_path):
+            os.renames(downloaded_path, target_path)
+        mark_present(asset.target_dir, asset.final_name)
+        # hf_hub_download exposes no per-chunk hook, so HF files advance progress on completion
+        size = os.path.getsize(target_path)
+        _advance_progress(size)
+        if pool is not None:
+            pool.add_bytes(size)
+        return True, f"✓ Successfully downloaded: {asset.final_name}"
+        
+    except Exception as e:
+        if pool is not None and _is_server_error(e):
+            pool.report_server_error()
+        return False, f"✗ Error downloading {asset.filename}: {e}"
+
+def _download_hf_assets(kind):
+    """Download every Hugging Face asset of one kind concurrently"""
+    def fetch(asset, pool):
+        ok, message = _fetch_hf_file(asset, pool)
+        print(message)
+        return ok
+    
+    # HF progress is only known per finished file, too coarse for AIMD, so the pool is fixed-size
+    workers = int(os.getenv("WAN22_PARALLEL_DOWNLOADS", "4"))
+    AdaptiveWorkerPool(fetch, assets_of(kind), workers=workers).run(abandon_on_stop=True)
 
 def download_huggingface_models():
     """Download models from Hugging Face"""
@@ -135,31 +467,7 @@ def download_huggingface_models():
     print("DOWNLOADING HUGGING FACE MODELS")
     print("=" * 60)
     
-    for config in WAN22_MANIFEST["huggingface_models"]:
-        target_path = os.path.join(config["target_dir"], config["final_name"])
-        
-        if os.path.exists(target_path):
-            print(f"✓ Already exists: {config['final_name']}")
-            continue
-            
-        print(f"Downloading {config['filename']}...")
-        
-        try:
-            ensure_directory(config["target_dir"])
-            
-            # Download to temporary location first
-            temp_file = hf_hub_download(
-                repo_id=config["repo_id"],
-                filename=config["filename"],
-                resume_download=True
-            )
-            
-            # Move to final location
-            shutil.move(temp_file, target_path)
-            print(f"✓ Successfully downloaded: {config['final_name']}")
-            
-        except Exception as e:
-            print(f"✗ Error downloading {config['filename']}: {e}")
+    _download_hf_assets("huggingface")
 
 def download_gguf_models():
     """Download GGUF models from Hugging Face"""
@@ -167,31 +475,209 @@ def download_gguf_models():
     print("DOWNLOADING GGUF MODELS")
     print("=" * 60)
     
-    for config in WAN22_MANIFEST["gguf_models"]:
-        target_path = os.path.join(config["target_dir"], config["final_name"])
+    _download_hf_assets("gguf")
+
+def _single_stream_get(url, target_path, headers):
+    """Stream a URL to target_path over one connection"""
+    response = _POOL.request("GET", url, headers=headers, preload_content=False)
+    try:
+        _raise_for_status(response, url)
         
-        if os.path.exists(target_path):
-            print(f"✓ Already exists: {config['final_name']}")
-            continue
+        # Save file in 4 MiB chunks through a 1 MiB buffer to keep write() syscalls low
+        with open(target_path, 'wb', buffering=1 << 20) as f:
+            content_length = response.headers.get("Content-Length")
+            if content_length and hasattr(os, "posix_fallocate"):
+                # Reserve the full extent up front to avoid fragmentation
+                os.posix_fallocate(f.fileno(), 0, int(content_length))
             
-        print(f"Downloading {config['filename']}...")
+            for chunk in response.stream(1 << 22):
+                _check_stop()
+                f.write(chunk)
+                _advance_progress(len(chunk))
+    finally:
+        response.release_conn()
+
+# O_DIRECT needs block-aligned offsets, lengths and buffer addresses
+DIRECT_IO_BLOCK = 4096
+DIRECT_IO_CHUNK = 4 << 20
+
+def _pwrite_all(fd, data, offset):
+    """pwrite all of data at offset, looping over short writes; a zero-byte write raises"""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        if written == 0:
+            raise OSError(errno.EIO, f"short write at offset {offset}")
+        view = view[written:]
+        offset += written
+
+class _DirectFile:
+    """Output file written with O_DIRECT where possible, bypassing the page cache
+    
+    A multi-GB model is written once and not read again until ComfyUI restarts, so caching
+    it only evicts useful pages and builds up a large writeback at the end. Unaligned writes,
+    and every write on filesystems without O_DIRECT (EINVAL, e.g. tmpfs), use a buffered fd.
+    """
+    
+    def __init__(self, path):
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        self.direct_fd = None
+        self.direct_ok = False
         
-        try:
-            ensure_directory(config["target_dir"])
-            
-            # Download GGUF model
-            temp_file = hf_hub_download(
-                repo_id=config["repo_id"],
-                filename=config["filename"],
-                resume_download=True
-            )
-            
-            # Move to final location
-            shutil.move(temp_file, target_path)
-            print(f"✓ Successfully downloaded: {config['final_name']}")
+        if hasattr(os, "O_DIRECT"):
+            try:
+                self.direct_fd = os.open(path, os.O_WRONLY | os.O_DIRECT | getattr(os, "O_NOATIME", 0))
+                self.direct_ok = True
+            except OSError:
+                pass
+    
+    def write(self, data, offset):
+        if self.direct_ok and offset % DIRECT_IO_BLOCK == 0 and len(data) % DIRECT_IO_BLOCK == 0:
+            try:
+                written = os.pwrite(self.direct_fd, data, offset)
+            except OSError as e:
+                if e.errno != errno.EINVAL:
+                    raise
+                self.direct_ok = False
+            else:
+                if written == len(data):
+                    return
+                # A partial direct write leaves an unaligned remainder; finish it buffered
+                data = memoryview(data)[written:]
+                offset += written
+        _pwrite_all(self.fd, data, offset)
+    
+    def close(self):
+        if hasattr(os, "posix_fadvise"):
+            # Drop whatever went through the page cache (tail, fallback writes)
+            os.posix_fadvise(self.fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        if self.direct_fd is not None:
+            os.close(self.direct_fd)
+        os.close(self.fd)
+
+def _probe_url(url, headers):
+    """Probe a URL with a one-byte ranged GET, returning (status, size, final_url, supports_ranges)
+    
+    Signed storage URLs behind redirects may reject HEAD, but every download host answers GET.
+    A 206 carries the total size in Content-Range; a 200 means the Range header was ignored.
+    """
+    response = _POOL.request("GET", url, headers={**headers, "Range": "bytes=0-0"},
+                             preload_content=False, redirect=True)
+    try:
+        if response.status == 206:
+            total = response.headers.get("Content-Range", "").rpartition("/")[2]
+            size = int(total) if total.isdigit() else 0
+            supports_ranges = True
+            response.drain_conn()
+        else:
+            size = int(response.headers.get("Content-Length", 0)) if response.status == 200 else 0
+            supports_ranges = False
+            # Never read a full (possibly multi-GB) body just to reuse the connection
+            response.close()
+        # geturl() is only the path when there was no redirect, so resolve it against the request URL
+        final_url = urljoin(url, response.geturl())
+    finally:
+        response.release_conn()
+    return response.status, size, final_url, supports_ranges
+
+def _parallel_range_get(url, target_path, headers, segment_size=64 << 20):
+    """Download a URL as concurrent HTTP Range requests on an adaptive pool, falling back to one stream"""
+    status, size, final_url, supports_ranges = _probe_url(url, headers)
+    
+    if not supports_ranges or size <= 0:
+        _single_stream_get(url, target_path, headers)
+        return
+    
+    # Civitai redirects to a signed CDN URL; final_url is reused for every range
+    # Many small segments let the pool rebalance as workers are added or retired;
+    # segment_size is a multiple of DIRECT_IO_CHUNK, so every segment starts aligned
+    ranges = [(start, min(start + segment_size, size) - 1) for start in range(0, size, segment_size)]
+    
+    out = _DirectFile(target_path)
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(out.fd, 0, size)
+        
+        def fetch_range(byte_range, pool):
+            start, end = byte_range
+            range_headers = {**headers, "Range": f"bytes={start}-{end}"}
+            response = _POOL.request("GET", final_url, headers=range_headers, preload_content=False)
             
-        except Exception as e:
-            print(f"✗ Error downloading {config['filename']}: {e}")
+            # Anonymous mmaps are page-aligned, as O_DIRECT requires of the source buffer
+            buf = mmap.mmap(-1, DIRECT_IO_CHUNK)
+            view = memoryview(buf)
+            filled = 0
+            offset = start
+            try:
+                _raise_for_status(response, final_url)
+                if response.status != 206:
+                    raise RuntimeError(f"Server ignored Range request (HTTP {response.status})")
+                
+                for chunk in response.stream(DIRECT_IO_CHUNK):
+                    _check_stop()
+                    chunk_view = memoryview(chunk)
+                    pos = 0
+                    while pos < len(chunk):
+                        n = min(len(chunk) - pos, DIRECT_IO_CHUNK - filled)
+                        view[filled:filled + n] = chunk_view[pos:pos + n]
+                        filled += n
+                        pos += n
+                        if filled == DIRECT_IO_CHUNK:
+                            out.write(view, offset)
+                            offset += filled
+                            filled = 0
+                    pool.add_bytes(len(chunk))
+                    _advance_progress(len(chunk))
+                
+                # Only the end of the file leaves a partial buffer: its aligned part still
+                # goes direct, the sub-block tail goes through the buffered fd
+                aligned = filled - filled % DIRECT_IO_BLOCK
+                if aligned:
+                    out.write(view[:aligned], offset)
+                if filled > aligned:
+                    out.write(view[aligned:filled], offset + aligned)
+                offset += filled
+            finally:
+                response.release_conn()
+                view.release()
+                buf.close()
+            return offset - start
+        
+        results = AdaptiveWorkerPool(fetch_range, ranges).run()
+        for byte_range, result in results:
+            if isinstance(result, Exception):
+                raise result
+        written = sum(result for byte_range, result in results)
+    finally:
+        out.close()
+    
+    if written != size:
+        raise RuntimeError(f"Incomplete download: got {written} of {size} bytes")
+
+def _promote_part_file(part_path, target_path):
+    """Move a finished .part file into place, copying in-kernel only if it crosses filesystems"""
+    try:
+        # Same filesystem: a metadata-only rename, atomic with respect to readers of target_path
+        os.replace(part_path, target_path)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    
+    # Cross-filesystem: copy_file_range keeps the bytes in the kernel, unlike shutil.move
+    with open(part_path, "rb") as src, open(target_path, "wb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    os.remove(part_path)
+
+def _civitai_url(model_id):
+    """Construct the Civitai download URL for a model version"""
+    query = urlencode({"type": "Model", "format": "Diffusers", "token": CIVITAI_TOKEN})
+    return f"https://civitai.com/api/download/models/{model_id}?{query}"
 
 def download_civitai_models():
     """Download models from Civitai"""
@@ -199,60 +685,122 @@ def download_civitai_models():
     print("DOWNLOADING CIVITAI MODELS")
     print("=" * 60)
     
-    # You'll need to add your Civitai API token here
-    CIVITAI_TOKEN = "00d790b1d7a9934acb89ef729d04c75a"  # From your wget command
-    
-    for config in WAN22_MANIFEST["civitai_models"]:
-        target_path = os.path.join(config["target_dir"], config["final_name"])
+    for asset in assets_of("civitai"):
+        _check_stop()
+        target_path = asset.final_path
         
-        if os.path.exists(target_path):
-            print(f"✓ Already exists: {config['final_name']}")
+        if is_present(asset.target_dir, asset.final_name):
+            print(f"✓ Already exists: {asset.final_name}")
             continue
             
-        print(f"Downloading from Civitai model {config['model_id']}...")
+        print(f"Downloading from Civitai model {asset.model_id}...")
         
+        part_path = target_path + ".part"
         try:
-            ensure_directory(config["target_dir"])
-            
-            # Construct Civitai download URL
-            url = f"https://civitai.com/api/download/models/{config['model_id']}?type=Model&format=Diffusers&token={CIVITAI_TOKEN}"
-            
-            # Download with proper headers
-            headers = {"User-Agent": "Mozilla/5.0"}
-            response = requests.get(url, headers=headers, stream=True)
-            response.raise_for_status()
-            
-            # Save file
-            with open(target_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Download with proper headers into a .part file, so an interrupted
+            # download never leaves a complete-looking file at target_path
+            _parallel_range_get(_civitai_url(asset.model_id), part_path, CIVITAI_HEADERS)
+            _promote_part_file(part_path, target_path)
+            mark_present(asset.target_dir, asset.final_name)
                     
-            print(f"✓ Successfully downloaded: {config['final_name']}")
+            print(f"✓ Successfully downloaded: {asset.final_name}")
             
         except Exception as e:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            if isinstance(e, DownloadCancelled):
+                raise
             print(f"✗ Error downloading from Civitai: {e}")
 
+def _duplicate_file(src, dst):
+    """Make dst a byte-identical copy of src as cheaply as possible, returning the method used"""
+    # ComfyUI only reads LoRAs, so sharing the inode is safe and costs no extra disk
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        pass
+    
+    # Copy-on-write clone on filesystems that support it (Btrfs, XFS); "always" fails
+    # instead of silently doing a full copy, so the method reported below is accurate
+    try:
+        subprocess.run(["cp", "--reflink=always", src, dst], check=True, capture_output=True)
+        return "reflink copy"
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    
+    shutil.copy2(src, dst)
+    return "full copy"
+
 def create_missing_instagirl_variants():
     """Create the high noise Instagirl LoRA if missing"""
     print("=" * 60)
     print("CREATING MISSING LORA VARIANTS")
     print("=" * 60)
     
-    lownoise_path = f"{BASE_DIR}/loras/Instagirlv2.0_lownoise.safetensors"
-    hinoise_path = f"{BASE_DIR}/loras/Instagirlv2.0_hinoise.safetensors"
+    loras_dir = f"{BASE_DIR}/loras"
+    lownoise_path = f"{loras_dir}/Instagirlv2.0_lownoise.safetensors"
+    hinoise_path = f"{loras_dir}/Instagirlv2.0_hinoise.safetensors"
+    has_lownoise = is_present(loras_dir, "Instagirlv2.0_lownoise.safetensors")
+    has_hinoise = is_present(loras_dir, "Instagirlv2.0_hinoise.safetensors")
     
     # If we have low noise but not high noise, copy it
-    if os.path.exists(lownoise_path) and not os.path.exists(hinoise_path):
+    if (has_lownoise and has_hinoise
+            and os.stat(lownoise_path).st_ino == os.stat(hinoise_path).st_ino):
+        # Same inode means same bytes, so there is nothing to compare or re-create
+        print("✓ High noise variant already exists (hardlinked to low noise)")
+    elif has_lownoise and not has_hinoise:
         print("Creating high noise variant from low noise LoRA...")
-        shutil.copy2(lownoise_path, hinoise_path)
-        print(f"✓ Created: Instagirlv2.0_hinoise.safetensors")
-    elif os.path.exists(hinoise_path):
+        method = _duplicate_file(lownoise_path, hinoise_path)
+        mark_present(loras_dir, "Instagirlv2.0_hinoise.safetensors")
+        print(f"✓ Created: Instagirlv2.0_hinoise.safetensors ({method})")
+    elif has_hinoise:
         print("✓ High noise variant already exists")
     else:
         print("⚠ Neither LoRA variant found - will need manual download")
 
+def _index_dir(d):
+    """Map entry names in a directory to their DirEntry (empty if the directory is missing)
+    
+    DirEntry.stat() costs a syscall on Linux, so callers stat only the entries they need.
+    """
+    if not os.path.isdir(d):
+        return {}
+    with os.scandir(d) as entries:
+        return {entry.name: entry for entry in entries}
+
+def _expected_hf_files():
+    """Map HF target paths to their (size, sha256) from the repo's LFS metadata"""
+    api = HfApi()
+    assets_by_repo = {}
+    for asset in assets_of("huggingface", "gguf"):
+        assets_by_repo.setdefault(asset.repo_id, []).append(asset)
+    
+    expected = {}
+    for repo_id, assets in assets_by_repo.items():
+        try:
+            infos = api.get_paths_info(repo_id, [asset.filename for asset in assets])
+        except Exception as e:
+            print(f"⚠ Could not fetch file metadata for {repo_id}: {e}")
+            continue
+        
+        lfs_by_name = {info.path: getattr(info, "lfs", None) for info in infos}
+        for asset in assets:
+            lfs = lfs_by_name.get(asset.filename)
+            if lfs is not None:
+                expected[asset.final_path] = (lfs.size, lfs.sha256)
+    return expected
+
+def _sha256_file(path):
+    """SHA256 of a file, hashed straight from an mmap instead of through a read buffer"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+
 def verify_installation():
-    """Verify all required files are present"""
+    """Verify all required files are present and match the expected size and SHA256"""
     print("=" * 60)
     print("VERIFICATION - Checking for required files")
     print("=" * 60)
@@ -274,23 +822,54 @@ def verify_installation():
     missing_files = []
     total_size = 0
     
+    # Hashing can be skipped on slow disks with WAN22_SKIP_SHA256=1; sizes are always checked
+    check_hashes = os.environ.get("WAN22_SKIP_SHA256") != "1"
+    expected_files = _expected_hf_files()
+    hashes_by_inode = {}
+    
+    # One listing per unique directory answers presence; only required files that exist get a stat
+    dir_index = {d: _index_dir(d) for d in {os.path.dirname(p) for p in required_files}}
+    
     for file_path in required_files:
-        if os.path.exists(file_path):
-            size = os.path.getsize(file_path) / (1024*1024*1024)  # GB
-            total_size += size
-            print(f"✓ {os.path.basename(file_path)} ({size:.2f} GB)")
-        else:
-            print(f"✗ MISSING: {os.path.basename(file_path)}")
+        name = os.path.basename(file_path)
+        entry = dir_index[os.path.dirname(file_path)].get(name)
+        if entry is None:
+            print(f"✗ MISSING: {name}")
             missing_files.append(file_path)
+            continue
+        entry_stat = entry.stat()
+        
+        expected_size, expected_sha256 = expected_files.get(file_path, (None, None))
+        
+        # A truncated or interrupted download is caught here without reading any data
+        if expected_size is not None and entry_stat.st_size != expected_size:
+            print(f"✗ CORRUPT: {name} ({entry_stat.st_size} of {expected_size} bytes)")
+            missing_files.append(file_path)
+            continue
+        
+        if check_hashes and expected_sha256:
+            # Hardlinked files share an inode, so each inode is hashed at most once
+            inode = (entry_stat.st_dev, entry_stat.st_ino)
+            if inode not in hashes_by_inode:
+                hashes_by_inode[inode] = _sha256_file(file_path)
+            if hashes_by_inode[inode] != expected_sha256:
+                print(f"✗ CORRUPT: {name} (SHA256 mismatch)")
+                missing_files.append(file_path)
+                continue
+        
+        size = entry_stat.st_size / (1024*1024*1024)  # GB
+        total_size += size
+        print(f"✓ {name} ({size:.2f} GB)")
     
     # Check custom nodes
     custom_nodes_dir = "/workspace/ComfyUI/custom_nodes"
     required_nodes = ["comfy-image-saver", "ComfyUI-GGUF", "RES4LYF"]
+    installed_nodes = set(os.listdir(custom_nodes_dir)) if os.path.isdir(custom_nodes_dir) else set()
     
     print(f"\nCustom Nodes:")
     for node in required_nodes:
         node_path = os.path.join(custom_nodes_dir, node)
-        if os.path.exists(node_path):
+        if node in installed_nodes:
             print(f"✓ {node}")
         else:
             print(f"✗ MISSING: {node}")
@@ -304,32 +883,136 @@ def verify_installation():
         print("Your Wan 2.2 Instagirl workflow should work perfectly.")
         print("\n⚠ IMPORTANT: Restart ComfyUI to load the new custom nodes!")
     else:
-        print(f"❌ {len(missing_files)} files/nodes are missing.")
+        print(f"❌ {len(missing_files)} files/nodes are missing or corrupt.")
         print("Check the errors above and re-run the script.")
     
     return len(missing_files) == 0
 
+def _preflight_hf_repo(repo_id, assets):
+    """Check that a Hugging Face repo contains every requested file, returning (failures, sizes)"""
+    try:
+        info = HfApi().model_info(repo_id, files_metadata=True)
+    except Exception as e:
+        return [f"✗ {repo_id}: {e}"], {}
+    
+    sizes_by_name = {sibling.rfilename: sibling.size or 0 for sibling in info.siblings or []}
+    failures = [f"✗ {repo_id}: missing {asset.filename}"
+                for asset in assets if asset.filename not in sizes_by_name]
+    sizes = {asset.final_path: sizes_by_name[asset.filename]
+             for asset in assets if asset.filename in sizes_by_name}
+    return failures, sizes
+
+def _preflight_civitai_model(asset):
+    """Check that a Civitai model resolves to a non-empty file, returning (failures, sizes)"""
+    try:
+        status, size, final_url, supports_ranges = _probe_url(_civitai_url(asset.model_id), CIVITAI_HEADERS)
+    except Exception as e:
+        return [f"✗ Civitai model {asset.model_id}: {e}"], {}
+    
+    if status not in (200, 206):
+        return [f"✗ Civitai model {asset.model_id}: HTTP {status}"], {}
+    if size <= 0:
+        return [f"✗ Civitai model {asset.model_id}: HTTP {status} without a file size (no Content-Range/Content-Length)"], {}
+    return [], {asset.final_path: size}
+
+def preflight_manifest():
+    """Check every asset still to be downloaded is reachable, returning their total size in bytes
+    
+    Exits before any download starts if anything is unreachable.
+    """
+    print("=" * 60)
+    print("PRE-FLIGHT - Checking manifest sources")
+    print("=" * 60)
+    
+    def pending(*kinds):
+        return [asset for asset in assets_of(*kinds) if not is_present(asset.target_dir, asset.final_name)]
+    
+    # One model_info call per repo covers all of its files
+    hf_by_repo = {}
+    for asset in pending("huggingface", "gguf"):
+        hf_by_repo.setdefault(asset.repo_id, []).append(asset)
+    
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = [executor.submit(_preflight_hf_repo, repo_id, assets)
+                   for repo_id, assets in hf_by_repo.items()]
+        futures += [executor.submit(_preflight_civitai_model, asset)
+                    for asset in pending("civitai")]
+        failures = []
+        sizes = {}
+        for future in futures:
+            future_failures, future_sizes = future.result()
+            failures += future_failures
+            sizes.update(future_sizes)
+    
+    if failures:
+        for failure in failures:
+            print(failure)
+        print(f"❌ {len(failures)} manifest entries are unreachable - aborting before any downloads.")
+        sys.exit(1)
+    
+    print("✓ All manifest sources reachable")
+    return sum(sizes.values())
+
 def main():
+    global GLOBAL_PBAR
+    
     print("Wan 2.2 Instagirl Complete Setup for ComfyUI")
     print("=" * 60)
     print("This script will download all required models and install custom nodes")
     print("for the Wan 2.2 Instagirl workflow.")
     print("=" * 60)
     
+    # Create every download target directory once, up front
+    for target_dir in sorted({asset.target_dir for asset in ASSETS}):
+        ensure_directory(target_dir)
+        # One listing per directory turns every later "already exists" check into a set lookup
+        PRESENT[target_dir] = {entry.name for entry in os.scandir(target_dir)}
+    
+    # The token is only needed for Civitai files still to download; re-runs can verify without it
+    missing_civitai = [asset for asset in assets_of("civitai") if not is_present(asset.target_dir, asset.final_name)]
+    if missing_civitai and not CIVITAI_TOKEN:
+        print("❌ No Civitai API token found, but these Civitai models still need downloading:")
+        for asset in missing_civitai:
+            print(f"  - {asset.final_name}")
+        print("Set CIVITAI_TOKEN or write the token to ~/.config/civitai/token and re-run.")
+        sys.exit(1)
+    
     try:
-        # Step 1: Install custom nodes
-        install_custom_nodes()
+        # Fail fast if any source has moved or vanished
+        total_bytes = preflight_manifest()
         
-        # Step 2: Download Hugging Face models
-        download_huggingface_models()
+        # A single shared bar replaces the per-file bars from huggingface_hub;
+        # smoothing=0 reports the average rate over the whole run instead of a jumpy instant rate
+        disable_progress_bars()
+        GLOBAL_PBAR = tqdm(total=total_bytes, unit="B", unit_scale=True, smoothing=0, desc="Downloading")
         
-        # Step 3: Download GGUF models
-        download_gguf_models()
-        
-        # Step 4: Download Civitai models
-        download_civitai_models()
+        # Steps 1-4 write to separate directories, so the git/pip work overlaps with the
+        # network-bound downloads: custom nodes, Hugging Face, GGUF and Civitai models
+        executor = ThreadPoolExecutor(max_workers=4)
+        futures = []
+        try:
+            futures = [
+                executor.submit(install_custom_nodes),
+                executor.submit(download_huggingface_models),
+                executor.submit(download_gguf_models),
+                executor.submit(download_civitai_models)
+            ]
+            for future in futures:
+                future.result()
+            executor.shutdown()
+        except BaseException:
+            # Ctrl-C or a failed stage: stop the other stages too instead of joining threads
+            # mid-download (a `with` block would), so main reports the failure and exits promptly
+            STOP.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            GLOBAL_PBAR.close()
+            GLOBAL_PBAR = None
         
-        # Step 5: Create missing variants
+        # Step 5: Create missing variants (needs the Civitai downloads)
         create_missing_instagirl_variants()
         
         # Step 6: Verify everything